@@ -24,42 +24,38 @@
 #
 # Usage:
 # python decorate_with_symlinks.py <source_root> <destination_root>
-#        [search_string] [replace_string] [--relative] [--mode=<value>]
-#        [--on-exists=<value>]
+#        [search_string] [replace_string] [--relative] [--quiet]
+#        [--mode=<value>] [--on-exists=<value>] [--jobs=<value>]
+#        [--ignore-dir=<name>]... [--no-default-ignores] [--plan-cache=<path>]
 #
 # Options:
+#   --quiet           - (optional) Suppresses per-file output, leaving only errors and the summary.
 #   --mode            - (optional) Specifies the mode: 'create' (default) or 'delete'.
 #   --on-exists       - (optional) Specifies the action when a file or symlink already exists at the destination:
 #                       'ask' (default), 'fail', 'skip', or 'execute'.
-#                       'ask' prompts the user for action (replace/delete, skip, or quit).
+#                       'ask' prompts the user for action (replace/delete, skip, or quit), optionally for all
+#                       remaining files.
+#   --jobs            - (optional) Number of files to process in parallel (default: 4 per usable CPU, at most 32).
+#                       Higher values can help on network filesystems, where each operation waits on a round-trip.
+#   --ignore-dir      - (optional) Name of a source directory not to traverse, in addition to the defaults (.git,
+#                       __pycache__, node_modules, build, dist, etc.). May be repeated.
+#   --no-default-ignores - (optional) Traverses the directories that are ignored by default.
+#   --plan-cache      - (optional) JSON file recording the symlinks created, so that files whose source is unchanged
+#                       and whose symlink is still in place are skipped on the next run (create mode only).
 #
 # ------------------------------------------------------------
 """
 
+import argparse
+import json
+import logging
 import os
 import sys
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 
-def print_usage():
-    """ Prints the usage instructions for the script. """
-    print("Usage: python decorate_with_symlinks.py <source_root> <destination_root> [search_string] [replace_string] [--relative] [--mode=<value>] [--on-exists=<value>]")
-    print("")
-    print("  source_root       - The root directory of the source repo (e.g., X)")
-    print("  destination_root  - The root directory of the destination repo (e.g., Y)")
-    print("  search_string     - (optional) The string to search for in the file paths")
-    print("  replace_string    - (optional) The string to replace 'search_string' with in the file paths")
-    print("  --relative        - (optional) Flag to create relative symlinks (default is absolute symlinks)")
-    print("  --mode            - (optional) Specifies the mode: 'create' (default) or 'delete'")
-    print("  --on-exists       - (optional) Specifies the action when a file or symlink already exists:")
-    print("                      'ask' (default), 'fail', 'skip', 'execute'")
-    print("")
-    print("Description:")
-    print("  This script will create symlinks in the destination directory (Y) pointing to files in the source directory (X).")
-    print("  If a symlink destination already exists, it will follow the behavior specified by --on-exists.")
-    print("  The script can replace occurrences of 'search_string' in the destination path with 'replace_string'.")
-    print("  Empty directories are not replicated, only files are symlinked.")
-    print("")
-    print("Example:")
-    print("  python decorate_with_symlinks.py /path/to/X /path/to/Y ..git .git --relative --mode=create --on-exists=ask")
+log = logging.getLogger(__name__)
 
 VALID_MODE_VALUES = ['create', 'delete']
 DEFAULT_MODE_VALUE = 'create'
@@ -67,62 +63,110 @@ DEFAULT_MODE_VALUE = 'create'
 VALID_ACTION_VALUES = ['ask', 'fail', 'skip', 'execute']
 DEFAULT_ACTION_VALUES = 'ask'
 
-def convert_path_to_relative(src, dest_root):
-    """ Convert the source path to a relative path from the destination root. """
-    return os.path.relpath(src, dest_root)
+MAX_DEFAULT_JOBS = 32
+MAX_TASKS_PER_GROUP = 64
 
-def convert_path_to_absolute(path):
-    """ Convert the given path to an absolute path. """
-    return os.path.abspath(path)
+# Names of source directories that are not traversed, as they are rarely wanted in the destination
+DEFAULT_IGNORED_DIRS = frozenset(['.git', '__pycache__', '.pytest_cache', '.tox', '.venv', 'node_modules', 'target', '.gradle', '.next', '.nuxt', 'dist', 'build'])
 
-def create_symlink(src, dest, relative=False):
-    """ Create a symlink for files or directories with support for relative and absolute symlinks. """
+# Whether files can be handled relative to an open directory FD (e.g., symlinkat), avoiding a full path lookup per call
+# (os.replace shares its dir_fd support with os.rename, which is the one listed)
+DIR_FD_SUPPORTED = {os.stat, os.symlink, os.readlink, os.unlink, os.rename} <= os.supports_dir_fd
+
+def get_default_jobs():
+    """ Get the default number of worker threads, i.e., several per usable CPU since the work is I/O-bound. """
     try:
-        # Remove the existing file (whether it's a regular file or symlink)
-        if os.path.exists(dest) or os.path.islink(dest):
-            os.remove(dest)
-            print(f"Removed existing file: {dest}")
+        cpu_count = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpu_count = os.cpu_count() or 1 # os.sched_getaffinity is not available on all platforms
 
-        # If relative, convert the source path to relative
-        if relative:
-            src = os.path.relpath(src, os.path.dirname(dest))
+    return min(MAX_DEFAULT_JOBS, cpu_count * 4)
 
-        os.symlink(src, dest)  # Creates symlink for both files and directories
+def dir_fd_path(path, dir_fd):
+    """ Return the path to use with dir_fd, i.e., the file name if a directory FD is given and the full path otherwise. """
+    return os.path.basename(path) if dir_fd is not None else path
 
-        print(f"Symlink created: {src} -> {dest}")
-    except FileExistsError:
-        print(f"Error: Symlink already exists: {dest}")
-        return False
-    except Exception as e:
-        print(f"Error creating symlink: {e}")
+def path_lexists(path, dir_fd=None):
+    """ Check whether a path exists, including broken symlinks, using a single lstat. """
+    try:
+        os.stat(dir_fd_path(path, dir_fd), dir_fd=dir_fd, follow_symlinks=False)
+    except OSError:
+        return False # Like os.path.lexists, treat unreachable paths (e.g., under a regular file) as missing
+    return True
+
+def replace_with_symlink(src, dest, dir_fd=None):
+    """ Atomically replace an existing file (whether it's a regular file or symlink) with a symlink, so the destination never goes missing. """
+    dest_path = dir_fd_path(dest, dir_fd)
+    temp_path = f"{dest_path}.tmp.{os.getpid()}"
+
+    try:
+        os.symlink(src, temp_path, dir_fd=dir_fd)
+
+        try:
+            os.replace(temp_path, dest_path, src_dir_fd=dir_fd, dst_dir_fd=dir_fd)
+        except OSError:
+            os.unlink(temp_path, dir_fd=dir_fd)
+            raise
+    except OSError as e:
+        # With a directory FD, the exception only names the file (or its temporary name), so report the full path
+        log.error("Error replacing %s with symlink: %s", dest, e.strerror)
         return False
+
+    log.info("Replaced existing file: %s", dest)
+    log.info("Symlink created: %s -> %s", src, dest)
     return True
 
-def remove_existing_file(file_path):
+def remove_existing_file(file_path, dir_fd=None):
     """ Remove a file if it exists. """
     try:
-        if os.path.exists(file_path):
-            os.remove(file_path)
-            print(f"Removed existing file: {file_path}")
-    except Exception as e:
-        print(f"Error removing file {file_path}: {e}")
+        # Let unlink report a missing file rather than probing first
+        os.unlink(dir_fd_path(file_path, dir_fd), dir_fd=dir_fd)
+        log.info("Removed existing file: %s", file_path)
+    except FileNotFoundError:
+        pass # Nothing to remove
+    except OSError as e:
+        log.error("Error removing file %s: %s", file_path, e.strerror)
+        return False
+    return True
 
 def create_directory(dir_path):
     """ Create directory if it doesn't exist. """
     try:
-        if not os.path.exists(dir_path):
-            os.makedirs(dir_path)
-            print(f"Created directory: {dir_path}")
-    except Exception as e:
-        print(f"Error creating directory {dir_path}: {e}")
+        # Let mkdir report existing directories rather than probing first
+        os.makedirs(dir_path, exist_ok=True)
+        log.debug("Ensured directory: %s", dir_path)
+    except OSError as e:
+        log.error("Error creating directory %s: %s", dir_path, e)
+        return False
+    return True
 
-def replace_in_path(path, search, replace, is_destination=False):
-    """ Replace a part of the path with a given string. """
-    # Apply the replacement only to the destination path
-    if is_destination:
-        return path.replace(search, replace)
+def iter_files(root, ignored_dirs=frozenset()):
+    """ Yield the paths of all non-directory entries below root, skipping directory symlinks and ignored directories. """
+    try:
+        with os.scandir(root) as entries:
+            entries = list(entries)
+    except OSError as e:
+        log.error("Error reading directory %s: %s", root, e)
+        return
+
+    # Visit entries in inode order, which tends to follow their on-disk layout and so reduces seeking
+    entries.sort(key=lambda entry: entry.inode())
+
+    for entry in entries:
+        if entry.is_dir():
+            # Like os.walk, symlinks to directories count as directories, so they are neither yielded nor descended into,
+            # and ignored directories are pruned without looking at their contents
+            if not entry.is_symlink() and entry.name not in ignored_dirs:
+                yield from iter_files(entry.path, ignored_dirs)
+        else:
+            yield entry.path
+
+def make_path_replacer(search, replace):
+    """ Return a function that replaces a part of a path with a given string, or leaves it unchanged if search is empty. """
+    if search:
+        return lambda path: path.replace(search, replace)
 
-    return path
+    return lambda path: path
 
 def validate_mode_value(mode_value):
     """ Validates the mode value to ensure it's within the allowed options. """
@@ -142,28 +186,27 @@ def validate_action_value(action_value, error_text_override=""):
 
         sys.exit(1)
 
-    if action_value not in VALID_ACTION_VALUES:
-        sys.exit(1)
-
     return action_value
 
-def validate_on_exists_action_value(action_value):
-    """ Validates the on-exists' action value to ensure it's within the allowed options. """
-    action_value = validate_action_value(action_value, f"Invalid value for --on-exists: {action_value}. Valid values are: {', '.join(VALID_ACTION_VALUES)}.")
-
-    return action_value
+def handle_existing_file_behavior(mode, action, target_file, dir_fd=None, session_defaults=None):
+    """
+    Handle the behavior when the destination file already exists.
 
-def handle_existing_file_behavior(mode, action, target_file):
-    """ Handle the behavior when the destination file already exists. """
+    When asking, the user can apply their choice to all remaining files by entering it in uppercase (or followed by
+    'all'). The choice is then stored per mode in session_defaults, if given, and used instead of asking again.
+    """
     validate_mode_value(mode)
     validate_action_value(action)
 
+    if action == 'ask' and session_defaults and mode in session_defaults:
+        action = session_defaults[mode]
+
     if action == 'fail':
-        print(f"File already exists: {target_file}")
+        log.error("File already exists: %s", target_file)
         return 'failed'
 
     if action == 'skip':
-        print(f"Skipping file: {target_file}")
+        log.info("Skipping file: %s", target_file)
         return 'skipped'
 
     if action == 'ask':
@@ -173,44 +216,179 @@ def handle_existing_file_behavior(mode, action, target_file):
 
         while True:
             if mode == 'create':
-                prompt_text = "Do you want to replace (r), skip (s), or fail (f)?"
+                prompt_text = "Do you want to replace (r), skip (s), or fail (f)? Use R or S to apply to all files."
                 execute_choices = ['r', 'replace']
-                invalid_text = "Please enter 'r' (replace), 's' (skip), or 'f' (fail)."
+                invalid_text = "Please enter 'r' (replace), 's' (skip), or 'f' (fail), or 'R' or 'S' to apply to all files."
             else:
                 assert mode == 'delete'
 
-                prompt_text = "Do you want to delete (d), skip (s), or fail (f)?"
+                prompt_text = "Do you want to delete (d), skip (s), or fail (f)? Use D or S to apply to all files."
                 execute_choices = ['d', 'delete']
-                invalid_text = "Please enter 'd' (delete), 's' (skip), or 'f' (fail)."
+                invalid_text = "Please enter 'd' (delete), 's' (skip), or 'f' (fail), or 'D' or 'S' to apply to all files."
 
-            user_choice = input(f"File {target_file} exists. {prompt_text} ").lower()
+            user_input = input(f"File {target_file} exists. {prompt_text} ").strip()
+            user_choice = user_input.lower()
+
+            # An uppercase letter or an 'all' suffix applies the choice to all remaining files
+            apply_to_all = (len(user_input) == 1 and user_input.isupper()) or user_choice.endswith(' all')
+
+            if user_choice.endswith(' all'):
+                user_choice = user_choice[:-len(' all')]
 
             if user_choice in execute_choices:
+                if apply_to_all and session_defaults is not None:
+                    session_defaults[mode] = 'execute'
+
                 break # Let common execute action handling take over
 
             if user_choice in ['s', 'skip']:
-                print(f"Skipping file: {target_file}")
+                if apply_to_all and session_defaults is not None:
+                    session_defaults[mode] = 'skip'
+
+                log.info("Skipping file: %s", target_file)
                 return 'skipped'
 
-            if user_choice in ['f', 'Failed']:
-                print("Failed operation.")
+            if user_choice in ['f', 'fail']:
+                log.error("Failed operation.")
                 return 'failed'
 
             print(f"Invalid input. {invalid_text}")
 
         if mode == 'create':
-            print(f"Replacing file: {target_file}")
+            log.info("Replacing file: %s", target_file)
         else:
             assert mode == 'delete'
-            print(f"Deleting file: {target_file}")
+            log.info("Deleting file: %s", target_file)
     else:
         assert action == 'execute'
 
-    # Execute action
-    remove_existing_file(target_file)
+    # Execute action, leaving replace_with_symlink to replace the file when creating so the swap is atomic
+    if mode == 'delete' and not remove_existing_file(target_file, dir_fd):
+        return 'error'
+
     return 'executed'
 
-def decorate_symlinks(source_root, dest_root, search_string='', replace_string='', relative_symlink=False, mode=DEFAULT_MODE_VALUE, action=DEFAULT_ACTION_VALUES):
+def decorate_file(link_source, target_file, mode, action, dir_fd=None, session_defaults=None):
+    """ Create the symlink if required, handling an existing destination file based on the on-exists behavior. """
+    if mode == 'create':
+        # The destination is normally absent, so attempt the symlink first and only handle an existing file if it fails
+        try:
+            os.symlink(link_source, dir_fd_path(target_file, dir_fd), dir_fd=dir_fd)
+            log.info("Symlink created: %s -> %s", link_source, target_file)
+            return 'executed'
+        except FileExistsError:
+            pass # Handled based on the on-exists behavior below
+        except OSError as e:
+            log.error("Error creating symlink %s: %s", target_file, e.strerror)
+            return 'error'
+    elif not path_lexists(target_file, dir_fd):
+        return 'unchanged' # Nothing to delete
+
+    action_result = handle_existing_file_behavior(mode, action, target_file, dir_fd, session_defaults)
+
+    if action_result != 'executed':
+        return action_result
+
+    if mode == 'create':
+        # Nothing is created if the existing file is already the wanted symlink
+        if is_symlink_to(link_source, target_file, dir_fd):
+            log.info("Symlink already up to date: %s -> %s", link_source, target_file)
+            return 'unchanged'
+
+        # Replace the existing file with the symlink
+        if not replace_with_symlink(link_source, target_file, dir_fd):
+            return 'error'
+
+    return 'executed'
+
+def load_plan_cache(plan_cache_path):
+    """ Load the plan cache from a previous run, returning an empty cache if there is none or it can't be read. """
+    try:
+        with open(plan_cache_path, encoding='utf-8') as plan_cache_file:
+            plan_cache = json.load(plan_cache_file)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        log.warning("Ignoring unreadable plan cache %s: %s", plan_cache_path, e)
+        return {}
+
+    return plan_cache if isinstance(plan_cache, dict) else {}
+
+def save_plan_cache(plan_cache_path, plan_cache):
+    """ Save the plan cache for the next run. """
+    try:
+        with open(plan_cache_path, 'w', encoding='utf-8') as plan_cache_file:
+            json.dump(plan_cache, plan_cache_file)
+    except OSError as e:
+        log.error("Error saving plan cache %s: %s", plan_cache_path, e)
+
+def get_plan_entry(file_path):
+    """ Get the plan cache entry identifying the current version of a source file, i.e., its mtime and inode. """
+    try:
+        file_stat = os.lstat(file_path)
+    except OSError:
+        return None
+    return [file_stat.st_mtime_ns, file_stat.st_ino]
+
+def is_symlink_to(link_source, target_file, dir_fd=None):
+    """ Check whether the target file is a symlink pointing at the given source. """
+    try:
+        return os.readlink(dir_fd_path(target_file, dir_fd), dir_fd=dir_fd) == link_source
+    except OSError:
+        return False
+
+def decorate_file_group(target_dir, tasks, mode, action, failed, plan_cache=None, session_defaults=None):
+    """
+    Decorates a group of files sharing a target directory, stopping early once any file has failed.
+
+    If supported, the target directory is opened once and all files are handled relative to it, so the kernel does not
+    have to look up every component of the target path for each file.
+
+    If a plan cache is given, files whose source is unchanged since the run that recorded it, and whose symlink still
+    points at it, are left untouched without applying the on-exists behavior.
+
+    Returns:
+        tuple: The action result of each file decorated, and the plan cache entries of the files now symlinked.
+    """
+    dir_fd = None
+
+    if DIR_FD_SUPPORTED:
+        try:
+            dir_fd = os.open(target_dir, os.O_RDONLY | os.O_DIRECTORY)
+        except OSError:
+            pass # Fall back to full paths, letting each file report its own error
+
+    action_results = []
+    plan_entries = {}
+
+    try:
+        for file_path, link_source, target_file, plan_key in tasks:
+            if failed.is_set():
+                break
+
+            plan_entry = None
+
+            if plan_cache is not None:
+                plan_entry = get_plan_entry(file_path)
+
+            if plan_entry is not None and plan_cache.get(plan_key) == plan_entry and is_symlink_to(link_source, target_file, dir_fd):
+                action_result = 'unchanged'
+            else:
+                action_result = decorate_file(link_source, target_file, mode, action, dir_fd, session_defaults)
+
+            action_results.append(action_result)
+
+            if action_result == 'failed':
+                failed.set()
+            elif plan_entry is not None and action_result in ['executed', 'unchanged']:
+                plan_entries[plan_key] = plan_entry
+    finally:
+        if dir_fd is not None:
+            os.close(dir_fd)
+
+    return action_results, plan_entries
+
+def decorate_symlinks(source_root, dest_root, search_string='', replace_string='', relative_symlink=False, mode=DEFAULT_MODE_VALUE, action=DEFAULT_ACTION_VALUES, plan_cache_path=None, jobs=None, ignored_dirs=DEFAULT_IGNORED_DIRS):
     """
     Replicates the source directory structure into the destination directory by creating symlinks.
 
@@ -219,6 +397,10 @@ def decorate_symlinks(source_root, dest_root, search_string='', replace_string='
     handles conflicts (e.g., when a file or symlink already exists at the destination) based on the action specified by
     the `--on-exists` option.
 
+    Files are processed concurrently on a thread pool, except when the action is 'ask', in which case they are processed
+    one at a time so that prompts do not interleave. Per-file output is logged at INFO level, and a single summary line
+    is printed once all files have been processed.
+
     Args:
         source_root (str): The root directory of the source directory to replicate.
         dest_root (str): The root directory of the destination where symlinks will be created.
@@ -227,6 +409,9 @@ def decorate_symlinks(source_root, dest_root, search_string='', replace_string='
         relative_symlink (bool, optional): Flag to indicate whether symlinks should be relative (default is absolute).
         mode (str, optional): Mode for symlink creation. Either 'create' (default) or 'delete'.
         action (str, optional): Action to take when a file exists at the destination. Options are 'ask', 'fail', 'skip', 'execute'.
+        plan_cache_path (str, optional): Path of a JSON file recording the symlinks created, used to skip unchanged files on the next run (create mode only).
+        jobs (int, optional): Number of worker threads to use (default is based on the number of usable CPUs).
+        ignored_dirs (set, optional): Names of source directories not to traverse (default is DEFAULT_IGNORED_DIRS).
 
     Returns:
         None: This function does not return a value, but performs operations such as creating symlinks, removing files, and printing output.
@@ -246,13 +431,14 @@ def decorate_symlinks(source_root, dest_root, search_string='', replace_string='
         sys.exit(1)
 
     # Convert both source and destination paths to absolute first
-    source_root = convert_path_to_absolute(source_root)
-    dest_root = convert_path_to_absolute(dest_root)
+    source_root = os.path.abspath(source_root)
+    dest_root = os.path.abspath(dest_root)
+    absolute_dest_root = dest_root
 
     # If --relative is passed, convert both paths to relative paths based on current working directory
     if relative_symlink:
-        source_root = convert_path_to_relative(source_root, os.getcwd())
-        dest_root = convert_path_to_relative(dest_root, os.getcwd())
+        source_root = os.path.relpath(source_root, os.getcwd())
+        dest_root = os.path.relpath(dest_root, os.getcwd())
 
         print("Using relative paths for source and destination.")
     else:
@@ -261,47 +447,179 @@ def decorate_symlinks(source_root, dest_root, search_string='', replace_string='
     print(f"Using source root: {source_root}")
     print(f"Using destination root: {dest_root}")
 
-    # Walk through the files in the source root
-    for root, dirs, files in os.walk(source_root):
-        for file in files:
-            # Get the full source file path
-            file_path = os.path.join(root, file)
+    # All traversed paths start with the source root, so their relative paths can be sliced off directly
+    source_prefix = os.path.join(source_root, '')
+    source_prefix_length = len(source_prefix)
 
-            # Apply the search/replace to the destination file path
-            file_with_correct_git = replace_in_path(file_path, search_string, replace_string, is_destination=True)
+    # Apply the search/replace only to the destination path
+    replace_path = make_path_replacer(search_string, replace_string)
 
-            # Get the relative path from the source root and target path
-            relative_path = os.path.relpath(file_with_correct_git, source_root)
-            target_file = os.path.join(dest_root, relative_path)
+    # Relative path from each target directory back to the source root, shared by all files in that directory
+    relative_source_root_by_dir = {}
 
-            # Ensure the target directory exists in the destination root
-            target_dir = os.path.dirname(target_file)
-            create_directory(target_dir)
+    # The plan cache only records symlinks, so it has no use when deleting
+    plan_cache = None
+    updated_plan_cache = {}
 
-            # Check if the file exists and handle based on the on-exists behavior
-            if os.path.exists(target_file) or os.path.islink(target_file):
-                action_result = handle_existing_file_behavior(mode, action, target_file)
+    if plan_cache_path and mode == 'create':
+        plan_cache = load_plan_cache(plan_cache_path)
 
-                if action_result == 'failed':
-                    print("Operation failed! Decorating process incomplete!")
-                    return
+    # Phase 1: Collect a (source file, symlink source, target file, plan cache key) task for each file in the source root,
+    # grouped by target directory
+    tasks_by_dir = {}
 
-                if action_result == 'skipped':
-                    continue
+    # Bind the path functions used per file to local names, saving attribute lookups in the loop
+    path_relpath = os.path.relpath
+    path_join = os.path.join
+    path_dirname = os.path.dirname
 
-            # Create the symlink
-            if mode == 'create':
-                create_symlink(file_path, target_file, relative_symlink)
+    for file_path in iter_files(source_root, ignored_dirs):
+        # Apply the search/replace to the destination file path
+        file_with_correct_git = replace_path(file_path)
+
+        # Get the relative path from the source root and target path, only falling back to relpath if the
+        # search/replace altered the source root part of the path
+        if file_with_correct_git.startswith(source_prefix):
+            relative_path = file_with_correct_git[source_prefix_length:]
+        else:
+            relative_path = path_relpath(file_with_correct_git, source_root)
+        target_file = path_join(dest_root, relative_path)
+        target_dir = path_dirname(target_file)
+
+        # If relative, point the symlink at the file via the target directory's path to the source root
+        if relative_symlink:
+            relative_source_root = relative_source_root_by_dir.get(target_dir)
+
+            if relative_source_root is None:
+                relative_source_root = path_relpath(source_root, target_dir)
+                relative_source_root_by_dir[target_dir] = relative_source_root
+
+            if relative_source_root == os.curdir:
+                link_source = file_path[source_prefix_length:]
+            else:
+                link_source = path_join(relative_source_root, file_path[source_prefix_length:])
+        else:
+            link_source = file_path
+
+        # Key the plan cache on the absolute target path, so it still matches when run from another directory
+        plan_key = path_join(absolute_dest_root, relative_path) if plan_cache is not None else None
+
+        tasks_by_dir.setdefault(target_dir, []).append((file_path, link_source, target_file, plan_key))
+
+    action_results = Counter()
+
+    # Ensure the target directories exist in the destination root, parents first so each makedirs only creates a leaf
+    for target_dir in sorted(tasks_by_dir, key=lambda d: d.count(os.sep)):
+        if not create_directory(target_dir):
+            # Files can't be symlinked into a missing directory, and there is nothing in it to delete
+            unreachable_tasks = tasks_by_dir.pop(target_dir)
+            action_results['error' if mode == 'create' else 'unchanged'] += len(unreachable_tasks)
+
+    # Phase 2: Decorate the files, splitting large directories into several groups so they still spread across workers
+    failed = threading.Event()
+
+    # Choices the user has applied to all remaining files when asked
+    session_defaults = {}
+
+    def decorate_group(group):
+        """ Decorate a (target directory, tasks) group. """
+        return decorate_file_group(*group, mode, action, failed, plan_cache, session_defaults)
+
+    groups = [(target_dir, tasks[i:i + MAX_TASKS_PER_GROUP])
+              for target_dir, tasks in tasks_by_dir.items()
+              for i in range(0, len(tasks), MAX_TASKS_PER_GROUP)]
+
+    with ThreadPoolExecutor(max_workers=jobs or get_default_jobs()) as executor:
+        if action == 'ask':
+            # Prompts must not interleave, so files are handled one at a time in this thread
+            results = map(decorate_group, groups)
+        else:
+            results = executor.map(decorate_group, groups)
+
+        # Collect every group's results, even after a failure, as groups already running still decorate files
+        for group_results, plan_entries in results:
+            action_results.update(group_results)
+            updated_plan_cache.update(plan_entries)
+
+    if plan_cache is not None:
+        # A complete run replaces the cache, dropping files no longer in the source, while an incomplete one keeps the
+        # entries of the files it didn't reach
+        if action_results['failed']:
+            plan_cache.update(updated_plan_cache)
+            updated_plan_cache = plan_cache
+
+        save_plan_cache(plan_cache_path, updated_plan_cache)
+
+    executed_text = 'symlinks created' if mode == 'create' else 'files deleted'
+    print(f"{action_results['executed']} {executed_text}, {action_results['unchanged']} unchanged, {action_results['skipped']} skipped, {action_results['error']} errors.")
+
+    if action_results['failed']:
+        print("Operation failed! Decorating process incomplete!")
+        return
 
     print("Decorating process complete!")
 
+class BufferedStreamHandler(logging.StreamHandler):
+    """ A stream handler that leaves flushing to the stream's own buffering, instead of flushing after every record. """
+
+    def flush(self):
+        """ Does nothing, so that per-file records are written in blocks when the stream is a file or pipe. """
+
+def parse_jobs_value(jobs_value):
+    """ Parses the jobs value, ensuring it's a positive integer. """
+    try:
+        jobs = int(jobs_value)
+    except ValueError:
+        jobs = 0
+
+    if jobs < 1:
+        raise argparse.ArgumentTypeError(f"invalid value: {jobs_value}. Must be a positive integer.")
+
+    return jobs
+
+def create_argument_parser():
+    """ Creates the command-line argument parser, including the usage instructions for the script. """
+    parser = argparse.ArgumentParser(
+        prog='decorate_with_symlinks.py',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        description=(
+            "This script will create symlinks in the destination directory (Y) pointing to files in the source directory (X).\n"
+            "If a symlink destination already exists, it will follow the behavior specified by --on-exists.\n"
+            "The script can replace occurrences of 'search_string' in the destination path with 'replace_string'.\n"
+            "Empty directories are not replicated, only files are symlinked."),
+        epilog=(
+            "Example:\n"
+            "  python decorate_with_symlinks.py /path/to/X /path/to/Y ..git .git --relative --mode=create --on-exists=ask"))
+
+    parser.add_argument('source_root', help="The root directory of the source repo (e.g., X)")
+    parser.add_argument('dest_root', metavar='destination_root', help="The root directory of the destination repo (e.g., Y)")
+    parser.add_argument('search_string', nargs='?', default='', help="(optional) The string to search for in the file paths")
+    parser.add_argument('replace_string', nargs='?', default='', help="(optional) The string to replace 'search_string' with in the file paths")
+    parser.add_argument('--relative', action='store_true', help="(optional) Flag to create relative symlinks (default is absolute symlinks)")
+    parser.add_argument('--quiet', action='store_true', help="(optional) Flag to suppress per-file output, leaving only errors and the summary")
+    parser.add_argument('--mode', choices=VALID_MODE_VALUES, default=DEFAULT_MODE_VALUE,
+                        help="(optional) Specifies the mode: 'create' (default) or 'delete'")
+    parser.add_argument('--on-exists', dest='action', choices=VALID_ACTION_VALUES, default=DEFAULT_ACTION_VALUES,
+                        help="(optional) Specifies the action when a file or symlink already exists: 'ask' (default), 'fail', 'skip', 'execute'")
+    parser.add_argument('--jobs', type=parse_jobs_value, default=get_default_jobs(),
+                        help="(optional) Number of files to process in parallel (default: %(default)s); higher values help on network filesystems")
+    parser.add_argument('--ignore-dir', dest='ignored_dirs', metavar='NAME', action='append', default=[],
+                        help="(optional) Name of a source directory not to traverse, in addition to the defaults (may be repeated)")
+    parser.add_argument('--no-default-ignores', action='store_true',
+                        help=f"(optional) Flag to traverse the directories ignored by default: {', '.join(sorted(DEFAULT_IGNORED_DIRS))}")
+    parser.add_argument('--plan-cache', metavar='PATH',
+                        help="(optional) JSON file recording the symlinks created, so unchanged files are skipped on the next run (create mode only)")
+
+    return parser
+
 def main():
     """
     Main entry point of the script. Handles command-line arguments, validates input, and calls the decorate_symlinks function.
 
-    This function parses the command-line arguments to retrieve the source and destination roots, optional search and replace strings,
+    This function parses the command-line arguments in a single pass with argparse to retrieve the source and destination roots, optional search and replace strings,
     the mode of operation ('create' or 'delete'), and the action to take when a file exists at the destination. It ensures that the
-    correct parameters are passed to the `decorate_symlinks` function and manages usage and error messages when the input is invalid.
+    correct parameters are passed to the `decorate_symlinks` function, with argparse managing usage and error messages when the input
+    is invalid.
 
     Command-line arguments:
         <source_root>       : Root directory of the source repo.
@@ -309,8 +627,13 @@ def main():
         [search_string]     : (optional) String to search for in file paths.
         [replace_string]    : (optional) String to replace search_string with in the file paths.
         --relative          : (optional) Flag to create relative symlinks.
+        --quiet             : (optional) Flag to suppress per-file output, leaving only errors and the summary.
         --mode              : (optional) Specifies the mode of operation ('create' or 'delete').
         --on-exists         : (optional) Specifies the action to take when a file exists at the destination ('ask', 'fail', 'skip', 'execute').
+        --jobs              : (optional) Number of files to process in parallel.
+        --ignore-dir        : (optional) Name of a source directory not to traverse (may be repeated).
+        --no-default-ignores: (optional) Flag to traverse the directories ignored by default.
+        --plan-cache        : (optional) JSON file recording the symlinks created, so unchanged files are skipped on the next run.
 
     Returns:
         None: This function does not return a value but terminates the script execution if an error occurs.
@@ -321,29 +644,20 @@ def main():
     Raises:
         SystemExit: If required arguments are missing, or if the command-line arguments are invalid.
     """
-    if len(sys.argv) < 3:
-        print_usage()
-        sys.exit(1)
+    args = create_argument_parser().parse_intermixed_args()
+
+    # Per-file output is only shown when not running quietly, and is buffered like print rather than flushed per line
+    logging.basicConfig(level=logging.WARNING if args.quiet else logging.INFO, format='%(message)s',
+                        handlers=[BufferedStreamHandler(sys.stdout)])
+
+    ignored_dirs = set(args.ignored_dirs)
+
+    if not args.no_default_ignores:
+        ignored_dirs |= DEFAULT_IGNORED_DIRS
+
+    decorate_symlinks(args.source_root, args.dest_root, args.search_string, args.replace_string, args.relative, args.mode, args.action, args.plan_cache, args.jobs, ignored_dirs)
 
-    source_root = sys.argv[1]
-    dest_root = sys.argv[2]
-    search_string = sys.argv[3] if len(sys.argv) > 3 else ''
-    replace_string = sys.argv[4] if len(sys.argv) > 4 else ''
-    relative_symlink = '--relative' in sys.argv
-    mode = DEFAULT_MODE_VALUE
-    action = DEFAULT_ACTION_VALUES
-
-    # Check for --mode argument
-    for arg in sys.argv:
-        if arg.startswith('--mode='):
-            mode = validate_mode_value(arg.split('=')[1])
-
-    # Check for --on-exists argument, i.e., action
-    for arg in sys.argv:
-        if arg.startswith('--on-exists='):
-            action = validate_on_exists_action_value(arg.split('=')[1])
-
-    decorate_symlinks(source_root, dest_root, search_string, replace_string, relative_symlink, mode, action)
+    sys.stdout.flush()
 
 if __name__ == "__main__":
     main()